@@ -9,9 +9,6 @@ Usage:
 """
 
 import sys
-import os
-
-sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
 
 from tmux_bridge import TmuxController
 
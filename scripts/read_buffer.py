@@ -15,9 +15,6 @@ Examples:
 
 import argparse
 import sys
-import os
-
-sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
 
 from tmux_bridge import TmuxController, TmuxError
 
@@ -30,9 +27,11 @@ def main() -> None:
     args = parser.parse_args()
 
     try:
-        ctrl = TmuxController(args.session)
-        output = ctrl.read_buffer(lines=args.lines, history=args.history)
-        print(output)
+        # Skip the upfront session check; a missing session surfaces as
+        # SessionNotFoundError from the first tmux command instead.
+        with TmuxController(args.session, validate=False) as ctrl:
+            output = ctrl.read_buffer(lines=args.lines, history=args.history)
+            print(output)
     except TmuxError as e:
         print(f"ERROR: {e}", file=sys.stderr)
         sys.exit(1)
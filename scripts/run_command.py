@@ -14,10 +14,6 @@ Examples:
 
 import argparse
 import sys
-import os
-
-# Add scripts directory to path so tmux_bridge can be imported
-sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
 
 from tmux_bridge import TmuxController, TmuxError, CommandTimeoutError
 
@@ -31,9 +27,9 @@ def main() -> None:
     args = parser.parse_args()
 
     try:
-        ctrl = TmuxController(args.session, default_timeout=args.timeout)
-        output = ctrl.execute_and_wait(args.command, use_markers=not args.no_markers)
-        print(output)
+        with TmuxController(args.session, default_timeout=args.timeout) as ctrl:
+            output = ctrl.execute_and_wait(args.command, use_markers=not args.no_markers)
+            print(output)
     except CommandTimeoutError as e:
         print(f"TIMEOUT: {e}", file=sys.stderr)
         sys.exit(2)
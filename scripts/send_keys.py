@@ -23,9 +23,6 @@ Examples:
 
 import argparse
 import sys
-import os
-
-sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
 
 from tmux_bridge import TmuxController, TmuxError
 
@@ -47,16 +44,21 @@ def main() -> None:
         parser.error("Provide either text or --ctrl KEY")
 
     try:
-        ctrl = TmuxController(args.session)
-        if args.ctrl is not None:
-            key = args.ctrl.lower()
-            tmux_key = _CTRL_MAP.get(key)
-            if tmux_key is None:
-                print(f"ERROR: Unknown ctrl key: {args.ctrl!r}", file=sys.stderr)
-                sys.exit(1)
-            ctrl.send_keys(tmux_key, enter=False)
-        if args.text is not None:
-            ctrl.send_keys(args.text, enter=not args.no_enter)
+        # Skip the upfront session check; a missing session surfaces as
+        # SessionNotFoundError from the first tmux command instead.
+        with TmuxController(args.session, validate=False) as ctrl:
+            keys: list[tuple[str, bool]] = []
+            if args.ctrl is not None:
+                key = args.ctrl.lower()
+                tmux_key = _CTRL_MAP.get(key)
+                if tmux_key is None:
+                    print(f"ERROR: Unknown ctrl key: {args.ctrl!r}", file=sys.stderr)
+                    sys.exit(1)
+                keys.append((tmux_key, False))
+            if args.text is not None:
+                keys.append((args.text, not args.no_enter))
+            # Ctrl key and text go out in a single send-keys command.
+            ctrl.send_many(keys)
     except TmuxError as e:
         print(f"ERROR: {e}", file=sys.stderr)
         sys.exit(1)
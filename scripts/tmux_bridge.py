@@ -13,24 +13,46 @@ Usage:
     2. Human authenticates (ssh, rl, etc.) inside that session.
     3. Agent uses TmuxController("myserver") to interact with it.
 
-Dependencies: Python 3.10+ standard library only.
+Dependencies: Python 3.10+ standard library only.  If ``hyperscan`` happens
+to be installed it is used to strip ANSI escapes from large buffers.
 """
 
 from __future__ import annotations
 
+import os
 import re
+import select
 import subprocess
 import time
 import uuid
 from dataclasses import dataclass, field
 
+try:
+    import hyperscan
+except ImportError:  # optional, see strip_ansi
+    hyperscan = None
+
 
 class TmuxError(Exception):
     """Base exception for tmux bridge errors."""
 
 
 class SessionNotFoundError(TmuxError):
-    """Raised when the target tmux session does not exist."""
+    """Raised when the target tmux session does not exist.
+
+    The available sessions listed in the message are only looked up when
+    the exception is turned into a string.
+    """
+
+    def __init__(self, session_name: str) -> None:
+        super().__init__(session_name)
+        self.session_name = session_name
+
+    def __str__(self) -> str:
+        return (
+            f"tmux session '{self.session_name}' does not exist. "
+            f"Available sessions: {TmuxController.list_sessions()}"
+        )
 
 
 class CommandTimeoutError(TmuxError):
@@ -38,42 +60,285 @@ class CommandTimeoutError(TmuxError):
 
 
 # ---------------------------------------------------------------------------
-# ANSI escape sequence pattern
-# Covers: CSI sequences, OSC sequences, simple escapes
+# ANSI escape sequence pattern (bytes)
+# Covers: CSI sequences, OSC sequences (BEL or ESC\ terminated), character
+# set selection, keypad mode and DEC line attributes
 # ---------------------------------------------------------------------------
 _ANSI_RE = re.compile(
-    r"""
-    \x1b          # ESC
-    (?:
-        \[        # CSI
-        [0-9;?]*  # parameter bytes
-        [A-Za-z]  # final byte
-      |
-        \]        # OSC
-        .*?       # payload
-        (?:\x07|\x1b\\)  # ST (BEL or ESC\)
-      |
-        [()][AB012]      # character set selection
-      |
-        [>=]             # keypad mode
-      |
-        \#[0-9]          # DEC line attrs
-    )
-    """,
-    re.VERBOSE,
+    rb"\x1b(?:\[[0-9;?]*[A-Za-z]|\].*?(?:\x07|\x1b\\)|[()][AB012]|[>=]|#[0-9])"
 )
 
 
-def strip_ansi(text: str) -> str:
-    """Remove ANSI escape sequences from *text* and return plain text."""
-    return _ANSI_RE.sub("", text)
+# Buffers at least this large are stripped with hyperscan when available;
+# below it the per-match Python callback costs more than it saves.
+_HS_MIN_SIZE = 64 * 1024
+
+if hyperscan is not None:
+    # The alternatives of _ANSI_RE as separate expressions.  Hyperscan
+    # reports every match rather than the leftmost-shortest one, which
+    # _hs_strip sorts out.  With SOM_LEFTMOST an end offset is reported for
+    # its leftmost start only, so the OSC payload may not run into another
+    # OSC (an unterminated OSC is therefore kept, unlike with _ANSI_RE).
+    _HS_DB = hyperscan.Database()
+    _HS_DB.compile(
+        expressions=[
+            rb"\x1b\[[0-9;?]*[A-Za-z]",
+            rb"\x1b\](?:[^\x07\x1b\n]|\x1b[^\x07\n\\\]])*(?:\x07|\x1b\\)",
+            rb"\x1b[()][AB012]",
+            rb"\x1b[>=]",
+            rb"\x1b#[0-9]",
+        ],
+        flags=[hyperscan.HS_FLAG_SOM_LEFTMOST] * 5,
+    )
+else:
+    _HS_DB = None
+
+
+def _hs_strip(data: bytes) -> bytes:
+    """Remove the spans matched by :data:`_HS_DB` from *data*."""
+    ends: dict[int, int] = {}
+
+    def on_match(
+        _id: int, start: int, end: int, _flags: int, _context: object
+    ) -> None:
+        # Keep the shortest match per start, like the lazy OSC payload.
+        if end < ends.get(start, end + 1):
+            ends[start] = end
+
+    _HS_DB.scan(data, match_event_handler=on_match)
+
+    out = bytearray()
+    pos = 0
+    for start in sorted(ends):
+        if start < pos:
+            continue  # inside a sequence that was already removed
+        out += data[pos:start]
+        pos = ends[start]
+    out += data[pos:]
+    return bytes(out)
+
+
+def strip_ansi(data: bytes) -> str:
+    """Remove ANSI escape sequences from *data* and return it as text.
+
+    Stripping works on the raw bytes tmux returns, so only the (shorter)
+    result has to be decoded.  Large buffers go through hyperscan's DFA
+    matcher when it is installed.
+    """
+    if _HS_DB is not None and len(data) >= _HS_MIN_SIZE:
+        return _hs_strip(data).decode("utf-8", "replace")
+    return _ANSI_RE.sub(b"", data).decode("utf-8", "replace")
+
+
+# ---------------------------------------------------------------------------
+# Control-mode client
+# ---------------------------------------------------------------------------
+
+def _quote(arg: str) -> str:
+    """Quote *arg* as a single word for the tmux command parser.
+
+    Control characters are written as octal escapes so that a command always
+    fits on one line of the control-mode pipe.
+    """
+    out = []
+    for ch in arg:
+        if ch in '\\"$':
+            out.append("\\" + ch)
+        elif ch < " " or ch == "\x7f":
+            out.append(f"\\{ord(ch):03o}")
+        else:
+            out.append(ch)
+    return '"' + "".join(out) + '"'
+
+
+class _ControlClient:
+    """A long-lived ``tmux -C`` client that runs commands over a pipe.
+
+    Every command written to the client's stdin is answered by a block framed
+    by ``%begin <time> <number> <flags>`` and ``%end``/``%error`` lines with
+    the same fields.  Lines outside of a block are notifications; the
+    ``%output`` ones of a single watched pane are collected so callers can
+    wait for the pane to change instead of polling it.
+    """
+
+    def __init__(self, session: str, timeout: float = 10) -> None:
+        try:
+            self._proc = subprocess.Popen(
+                # -E: do not apply update-environment, which would copy this
+                # process's SSH_AUTH_SOCK, KRB5CCNAME, ... into the session.
+                ["tmux", "-C", "attach", "-E", "-t", session],
+                stdin=subprocess.PIPE,
+                stdout=subprocess.PIPE,
+                stderr=subprocess.DEVNULL,
+                bufsize=0,
+            )
+        except FileNotFoundError:
+            raise TmuxError(
+                "tmux is not installed or not in PATH"
+            ) from None
+        self._fd = self._proc.stdout.fileno()
+        self._buf = bytearray()
+        self._timeout = timeout
+        self._pane: bytes | None = None
+        self._output = bytearray()
+
+        # The attach itself is answered by a block that was not issued by
+        # this client (flags 0); it carries the error if attaching failed.
+        try:
+            ok, out = self._read_block(own=False)
+        except TmuxError:
+            self.close()
+            raise
+        if not ok:
+            self.close()
+            raise TmuxError(
+                f"tmux attach failed: {out.decode('utf-8', 'replace').strip()}"
+            )
+
+    @property
+    def alive(self) -> bool:
+        """Whether the underlying tmux client is still running."""
+        return self._proc.poll() is None
+
+    def command(self, *args: str) -> bytes:
+        """Run a tmux command and return its output.
+
+        Raises :class:`TmuxError` if tmux reports an error.
+        """
+        line = " ".join(_quote(a) for a in args) + "\n"
+        try:
+            self._proc.stdin.write(line.encode())
+        except (BrokenPipeError, ValueError):
+            raise TmuxError(
+                "tmux control client exited unexpectedly"
+            ) from None
+        ok, out = self._read_block(own=True)
+        if not ok:
+            raise TmuxError(
+                f"tmux command failed: tmux {' '.join(args)}\n"
+                f"stderr: {out.decode('utf-8', 'replace').strip()}"
+            )
+        return out
+
+    def watch(self, pane_id: str | None) -> None:
+        """Collect ``%output`` of *pane_id* from now on, dropping the rest.
+
+        ``None`` stops collecting altogether.
+        """
+        self._pane = pane_id.encode() if pane_id is not None else None
+        self._output.clear()
+
+    def read_output(self, deadline: float) -> bytes:
+        """Return output of the watched pane, blocking until *deadline*.
+
+        Returns as soon as any output is available, together with whatever
+        else has already been read from the pipe, or ``b""`` if none arrived
+        in time.
+        """
+        while True:
+            # Once there is output, only drain lines that are already read.
+            line = self._readline(deadline if not self._output else 0.0)
+            if line is None:
+                break
+            if line.startswith(b"%begin "):
+                self._read_block_body(line, deadline)
+            else:
+                self._notify(line)
+        data = bytes(self._output)
+        self._output.clear()
+        return data
+
+    def close(self) -> None:
+        """Detach the client and reap the process."""
+        # communicate() closes stdin, which detaches the client, and drains
+        # stdout up to EOF: notifications queued since the last command
+        # would otherwise fill the pipe and keep tmux from ever getting to
+        # %exit.
+        try:
+            self._proc.communicate(timeout=self._timeout)
+        except subprocess.TimeoutExpired:
+            self._proc.kill()
+            self._proc.communicate()
+
+    def _read_block(self, *, own: bool) -> tuple[bool, bytes]:
+        """Read up to the next block and return ``(success, output)``.
+
+        With *own* set, blocks not issued by this client are skipped.
+        Notifications read on the way are handled as usual.
+        """
+        deadline = time.monotonic() + self._timeout
+        while True:
+            line = self._readline(deadline)
+            if line is None:
+                raise TmuxError("tmux control client timed out")
+            if line.startswith(b"%begin "):
+                ok, out, flags = self._read_block_body(line, deadline)
+                if (flags == b"1") == own:
+                    return ok, out
+            else:
+                self._notify(line)
+
+    def _read_block_body(
+        self, begin: bytes, deadline: float
+    ) -> tuple[bool, bytes, bytes]:
+        """Read the block opened by *begin*; return ``(ok, output, flags)``."""
+        guard = begin[len(b"%begin "):]
+        out = bytearray()
+        while True:
+            line = self._readline(deadline)
+            if line is None:
+                raise TmuxError("tmux control client timed out")
+            if line == b"%end " + guard or line == b"%error " + guard:
+                break
+            out += line + b"\n"
+        flags = guard.rsplit(b" ", 1)[-1]
+        return line.startswith(b"%end"), bytes(out), flags
+
+    def _notify(self, line: bytes) -> None:
+        """Handle a notification line."""
+        if line.startswith(b"%output "):
+            pane, _, data = line[len(b"%output "):].partition(b" ")
+            if pane == self._pane:
+                # tmux writes control characters and backslashes as \ooo
+                # octal escapes, which unicode_escape undoes in C; every
+                # other byte passes through as Latin-1.
+                self._output += data.decode("unicode_escape").encode("latin-1")
+        elif line.startswith(b"%exit"):
+            raise TmuxError(
+                "tmux control client exited: "
+                f"{line.decode('utf-8', 'replace')}"
+            )
+        # Other notifications are not needed here.
+
+    def _readline(self, deadline: float) -> bytes | None:
+        """Return the next line without the newline, or ``None`` on timeout."""
+        while True:
+            idx = self._buf.find(b"\n")
+            if idx != -1:
+                line = bytes(self._buf[:idx])
+                del self._buf[:idx + 1]
+                return line
+            remaining = deadline - time.monotonic()
+            if remaining <= 0 or not select.select(
+                [self._fd], [], [], remaining
+            )[0]:
+                return None
+            chunk = os.read(self._fd, 65536)
+            if not chunk:
+                raise TmuxError("tmux control client exited unexpectedly")
+            self._buf += chunk
 
 
 # ---------------------------------------------------------------------------
 # TmuxController
 # ---------------------------------------------------------------------------
 
-@dataclass
+# First poll delay of the prompt-pattern fallback; it doubles on every poll
+# up to the poll interval.
+_MIN_POLL_INTERVAL = 0.005
+
+
+@dataclass(slots=True)
 class TmuxController:
     """Control a tmux pane: send keys, read buffer, execute commands.
 
@@ -88,14 +353,24 @@ class TmuxController:
     default_timeout:
         Default timeout in seconds for :meth:`execute_and_wait`.
     poll_interval:
-        Seconds between buffer polls when waiting for command completion.
+        Maximum seconds between buffer polls when waiting for the prompt
+        pattern; polling starts at 5 ms and backs off up to this.
+        Marker-based execution waits on pane output notifications instead.
+    validate:
+        If ``True`` (default), check that the session exists on
+        construction.  Otherwise nothing touches tmux until the first
+        command, which raises :class:`SessionNotFoundError` if needed.
     """
 
     session_name: str
     prompt_pattern: str = r"[\$#>] $"
     default_timeout: float = 30.0
     poll_interval: float = 0.3
+    validate: bool = True
     _target: str = field(init=False, repr=False)
+    _prompt_re: re.Pattern[str] = field(init=False, repr=False)
+    _ctrl: _ControlClient | None = field(init=False, repr=False, default=None)
+    _scroll_cursor: int = field(init=False, repr=False, default=0)
 
     def __post_init__(self) -> None:
         # If the caller passed a full target (session:window.pane), use it
@@ -105,12 +380,12 @@ class TmuxController:
         else:
             self._target = self.session_name
 
-        # Validate that the session exists.
-        if not self._session_exists():
-            raise SessionNotFoundError(
-                f"tmux session '{self.session_name}' does not exist. "
-                f"Available sessions: {self.list_sessions()}"
-            )
+        self._prompt_re = re.compile(self.prompt_pattern, re.MULTILINE)
+
+        # Validate that the session exists.  This also attaches the
+        # control-mode client used by all later commands.
+        if self.validate and not self._session_exists():
+            raise SessionNotFoundError(self.session_name)
 
     # ------------------------------------------------------------------
     # Public API
@@ -126,9 +401,23 @@ class TmuxController:
         enter:
             If ``True`` (default), press Enter after sending the text.
         """
-        args = ["send-keys", "-t", self._target, text]
-        if enter:
-            args.append("Enter")
+        self.send_many([(text, enter)])
+
+    def send_many(self, keys: list[tuple[str, bool]]) -> None:
+        """Send several pieces of text to the target pane in one go.
+
+        Parameters
+        ----------
+        keys:
+            ``(text, enter)`` pairs, typed in order; Enter is pressed after
+            each *text* whose *enter* is ``True``.  All of them go out as a
+            single ``send-keys`` command.
+        """
+        args = ["send-keys", "-t", self._target]
+        for text, enter in keys:
+            args.append(text)
+            if enter:
+                args.append("Enter")
         self._run_tmux(*args)
 
     def read_buffer(
@@ -152,13 +441,20 @@ class TmuxController:
             Plain text with ANSI escapes stripped.
         """
         args = ["capture-pane", "-t", self._target, "-p"]
+        if lines is not None:
+            # Let tmux cut out the last *lines* lines: line 0 is the top of
+            # the visible pane and negative lines are scroll-back.
+            height = int(self._run_tmux(
+                "display-message", "-p", "-t", self._target, "#{pane_height}"
+            ))
+            start = height - lines
+            if not history:
+                start = max(0, start)
+            args.extend(["-S", str(start)])
+            return strip_ansi(self._run_tmux(*args)).removesuffix("\n")
         if history:
             args.extend(["-S", "-"])
-        raw = self._run_tmux(*args)
-        cleaned = strip_ansi(raw)
-        if lines is not None:
-            cleaned = "\n".join(cleaned.splitlines()[-lines:])
-        return cleaned
+        return strip_ansi(self._run_tmux(*args))
 
     def execute_and_wait(
         self,
@@ -184,7 +480,8 @@ class TmuxController:
         timeout:
             Maximum seconds to wait.  Defaults to ``self.default_timeout``.
         poll_interval:
-            Override the default poll interval for this call.
+            Override the default poll interval for this call (prompt
+            fallback only).
         use_markers:
             When ``True`` (default), wrap the command with echo markers for
             reliable output extraction.
@@ -204,9 +501,21 @@ class TmuxController:
         interval = poll_interval if poll_interval is not None else self.poll_interval
 
         if use_markers:
-            return self._execute_with_markers(command, timeout, interval)
+            return self._execute_with_markers(command, timeout)
         return self._execute_with_prompt(command, timeout, interval)
 
+    def close(self) -> None:
+        """Detach the control-mode client.  The session is left untouched."""
+        if self._ctrl is not None:
+            self._ctrl.close()
+            self._ctrl = None
+
+    def __enter__(self) -> TmuxController:
+        return self
+
+    def __exit__(self, *exc_info: object) -> None:
+        self.close()
+
     # ------------------------------------------------------------------
     # Class / static helpers
     # ------------------------------------------------------------------
@@ -215,17 +524,22 @@ class TmuxController:
     def list_sessions() -> list[str]:
         """Return a list of existing tmux session names."""
         try:
-            out = TmuxController._run_tmux(
+            out = TmuxController._run_tmux_once(
                 "list-sessions", "-F", "#{session_name}"
             )
-            return [s for s in out.splitlines() if s.strip()]
+            return [s for s in out.decode().splitlines() if s.strip()]
         except TmuxError:
             return []
 
     @staticmethod
     def session_exists(name: str) -> bool:
         """Check whether a tmux session *name* exists."""
-        return name in TmuxController.list_sessions()
+        # "=" asks tmux for an exact match instead of a name prefix.
+        try:
+            TmuxController._run_tmux_once("has-session", "-t", f"={name}")
+            return True
+        except TmuxError:
+            return False
 
     # ------------------------------------------------------------------
     # Internal helpers
@@ -234,149 +548,245 @@ class TmuxController:
     def _session_exists(self) -> bool:
         """Check that our target session is reachable."""
         try:
-            self._run_tmux("has-session", "-t", self._target)
+            self._control()
             return True
         except TmuxError:
             return False
 
-    def _execute_with_markers(
-        self, command: str, timeout: float, interval: float
-    ) -> str:
-        """Marker-based synchronous execution."""
+    def _control(self) -> _ControlClient:
+        """Return the control-mode client, (re)attaching it if needed."""
+        if self._ctrl is None or not self._ctrl.alive:
+            # Attach to the target's session by id: attaching to a window or
+            # pane target (including %pane / @window ids) would make it the
+            # current one for the human as well.
+            # list-panes rather than display-message, which prints nothing
+            # but still succeeds for a target that does not exist.
+            # Any failure to resolve the target (no such session or pane, no
+            # server, no socket to connect to) means it is not there, as in
+            # the check on construction.
+            try:
+                session_id = self._run_tmux_once(
+                    "list-panes", "-t", self._target, "-F", "#{session_id}",
+                ).decode().split()[0]
+            except TmuxError:
+                raise SessionNotFoundError(self.session_name) from None
+            self._ctrl = _ControlClient(session_id)
+        return self._ctrl
+
+    def _execute_with_markers(self, command: str, timeout: float) -> str:
+        """Marker-based synchronous execution.
+
+        Instead of polling the pane, this blocks on the ``%output``
+        notifications that tmux pushes through the control-mode client and
+        captures the pane only once the end marker has been printed.
+        """
         uid = uuid.uuid4().hex[:12]
         start_marker = f"__TMUX_BRIDGE_START_{uid}__"
         end_marker = f"__TMUX_BRIDGE_END_{uid}__"
+        # Both markers as lines of their own, found in one pass.  END is
+        # printed after a newline of its own so that output without a final
+        # newline still leaves it on a fresh line; that one line break is
+        # not part of the output.
+        marker_re = re.compile(
+            rf"^{re.escape(start_marker)}\n(.*?)\n?^{re.escape(end_marker)}$",
+            re.MULTILINE | re.DOTALL,
+        )
 
-        # Send start marker and wait until it actually appears in the buffer
-        # before sending the command.
-        self.send_keys(f"echo '{start_marker}'", enter=True)
-
-        marker_deadline = time.monotonic() + timeout
-        while time.monotonic() < marker_deadline:
-            buf = self.read_buffer(history=True)
-            if start_marker in buf:
-                break
-            time.sleep(interval)
-        else:
+        ctrl = self._control()
+        pane_id, history_size, cursor_y = self._run_tmux(
+            "display-message", "-p", "-t", self._target,
+            "#{pane_id} #{history_size} #{cursor_y}",
+        ).decode().split()
+        ctrl.watch(pane_id)
+        # Absolute line (counted from the top of the scroll-back) on which
+        # the start marker is typed; only the pane from there on is captured.
+        self._scroll_cursor = int(history_size) + int(cursor_y)
+
+        # Send both markers and the command as one shell line.  `;` prints
+        # the end marker only after the command finishes, whatever its exit
+        # status, and keeps the markers from being interleaved with the
+        # command's echo or output.  printf fills in the marker name, so the
+        # typed line never contains a marker verbatim, not even where the
+        # terminal wraps it.  The end marker is preceded by a newline so it
+        # starts a line of its own even if the output does not end with one.
+        marker_fmt = f"__TMUX_BRIDGE_%s_{uid}__\\n"
+        try:
+            self.send_keys(
+                f"printf '{marker_fmt}' START; {command}; "
+                f"printf '\\n{marker_fmt}' END",
+                enter=True,
+            )
+            done = self._wait_for_marker(
+                ctrl, end_marker, time.monotonic() + timeout
+            )
+        finally:
+            # Otherwise the pane's output would pile up in the client
+            # during every later command.
+            ctrl.watch(None)
+        if not done:
             raise CommandTimeoutError(
-                f"Start marker did not appear within {timeout}s"
+                f"Command did not complete within {timeout}s: {command!r}"
             )
 
-        # Chain the command and the end-marker echo in a single send_keys
-        # call using ` ; ` so the shell executes the end-marker echo only
-        # after the command finishes.  Sending them separately would cause
-        # the end-marker echo to be queued in the terminal input buffer and
-        # appear interleaved with the command's output.
-        self.send_keys(
-            f"{command} ; echo '{end_marker}'", enter=True
-        )
-
-        deadline = time.monotonic() + timeout
-        while time.monotonic() < deadline:
+        history_size = int(self._run_tmux(
+            "display-message", "-p", "-t", self._target, "#{history_size}"
+        ))
+        buf = strip_ansi(self._run_tmux(
+            "capture-pane", "-t", self._target, "-p",
+            "-S", str(self._scroll_cursor - history_size),
+        ))
+        match = marker_re.search(buf)
+        if match is None:
+            # Lines dropped off a full scroll-back shift everything up, so
+            # the cursor may point past the start; read all of it instead.
             buf = self.read_buffer(history=True)
-            # Look for both markers in the buffer
-            start_idx = buf.rfind(start_marker)
-            end_idx = buf.rfind(end_marker)
-            if start_idx != -1 and end_idx != -1 and end_idx > start_idx:
-                # Extract text between markers
-                output = buf[start_idx + len(start_marker): end_idx]
-                return self._clean_marker_output(output, command)
-            time.sleep(interval)
+            match = marker_re.search(buf)
+        if match is not None:
+            output = match.group(1)
+        else:
+            # The start marker has scrolled out of the history entirely;
+            # return what is left of the output.
+            output = buf.rpartition(end_marker)[0]
+        return self._clean_marker_output(output)
 
-        raise CommandTimeoutError(
-            f"Command did not complete within {timeout}s: {command!r}"
+    @staticmethod
+    def _wait_for_marker(
+        ctrl: _ControlClient, marker: str, deadline: float
+    ) -> bool:
+        """Read pane output until *marker* is printed.
+
+        Each chunk is stripped of ANSI escapes once, as it arrives; an escape
+        sequence split across chunks is held back until it is complete.
+        Only a line consisting of the marker alone counts.
+        Returns ``False`` if *deadline* passes first.
+        """
+        marker_re = re.compile(
+            rb"[\r\n]" + re.escape(marker.encode()) + rb"\r?\n"
         )
+        clean = bytearray()
+        tail = b""
+        scanned = 0
+        while True:
+            chunk = ctrl.read_output(deadline)
+            if not chunk:
+                return False
+            data = tail + chunk
+            cut = data.rfind(b"\x1b")
+            if (
+                cut == -1
+                or b"\n" in data[cut:]  # sequences never span lines
+                or _ANSI_RE.match(data, cut)
+            ):
+                cut = len(data)
+            clean += _ANSI_RE.sub(b"", data[:cut])
+            tail = data[cut:]
+            if marker_re.search(clean, max(0, scanned - len(marker) - 3)):
+                return True
+            scanned = len(clean)
 
     def _execute_with_prompt(
         self, command: str, timeout: float, interval: float
     ) -> str:
         """Prompt-pattern fallback for synchronous execution."""
-        # Capture buffer before sending the command
-        pre_buffer = self.read_buffer(history=True)
+        # Absolute line (counted from the top of the scroll-back) on which
+        # the command is typed, as in the marker path; the new content is
+        # the capture from there on.
+        pre_rows = self.read_buffer(history=True).splitlines()
+        history_size, cursor_y, history_limit = (
+            int(n) for n in self._run_tmux(
+                "display-message", "-p", "-t", self._target,
+                "#{history_size} #{cursor_y} #{history_limit}",
+            ).split()
+        )
+        first = history_size + cursor_y
+        # The rows just above that line, to find it again once lines have
+        # dropped off the top of a full scroll-back; tmux drops the oldest
+        # tenth of the limit at a time.
+        above = pre_rows[max(0, first - 3):first]
+        trim = max(1, history_limit // 10)
 
         self.send_keys(command, enter=True)
-        prompt_re = re.compile(self.prompt_pattern, re.MULTILINE)
+        # Whitespace-free form of the command, for spotting its echo even
+        # where the pane wraps it.
+        cmd_key = "".join(command.split())
 
+        # Check right away, then poll quickly so fast commands return
+        # promptly, backing off exponentially up to *interval* for slow ones.
+        backoff = min(interval, _MIN_POLL_INTERVAL)
         deadline = time.monotonic() + timeout
-        while time.monotonic() < deadline:
-            time.sleep(interval)
-            buf = self.read_buffer(history=True)
-            # New content is everything after the old buffer
-            new_content = buf[len(pre_buffer):]
-            lines = new_content.splitlines()
-            if lines and prompt_re.search(lines[-1]):
-                # Remove the last line (prompt) and the first line (echo of
-                # the typed command).
-                output_lines = lines[1:-1] if len(lines) > 1 else []
+        while True:
+            rows = self.read_buffer(history=True).splitlines()
+            # Find the line again by the rows above it; if those are gone
+            # as well, the line number is used as is.
+            row = next(
+                (r for r in range(first, 0, -trim)
+                 if rows[max(0, r - len(above)):r] == above),
+                first,
+            )
+            lines = "\n".join(rows[row:]).rstrip().splitlines()
+            # Until the shell has echoed the command, any prompt on screen
+            # is still the one from before it.  The output starts on the
+            # line after the echo.
+            start, seen = 0, ""
+            while start < len(lines) and cmd_key not in seen:
+                seen += "".join(lines[start].split())
+                start += 1
+            echoed = cmd_key in seen
+            if echoed and lines and self._prompt_re.search(lines[-1]):
+                # Remove the last line (prompt) and the echo of the typed
+                # command.
+                output_lines = lines[start:-1] if len(lines) > start else []
                 return "\n".join(output_lines)
-            # Also check visible pane (last line)
-            visible = self.read_buffer(lines=1)
-            if prompt_re.search(visible):
-                new_content = buf[len(pre_buffer):]
-                output_lines = new_content.splitlines()
-                if output_lines:
-                    output_lines = output_lines[1:]  # remove echoed command
-                if output_lines and prompt_re.search(output_lines[-1]):
+            # Also check the bottom line of the pane, which is the last line
+            # of the capture as well
+            if echoed and rows and self._prompt_re.search(rows[-1]):
+                output_lines = lines[start:]  # remove echoed command
+                if output_lines and self._prompt_re.search(output_lines[-1]):
                     output_lines = output_lines[:-1]  # remove prompt
                 return "\n".join(output_lines)
+            if time.monotonic() >= deadline:
+                break
+            time.sleep(backoff)
+            backoff = min(interval, backoff * 2)
 
         raise CommandTimeoutError(
             f"Prompt not detected within {timeout}s: {command!r}"
         )
 
     @staticmethod
-    def _clean_marker_output(raw: str, command: str) -> str:
+    def _clean_marker_output(raw: str) -> str:
         """Clean up the output between markers.
 
-        Removes:
-        - The echo command lines for the markers themselves
-        - The echoed command line
-        - Leading/trailing blank lines
+        Only leading/trailing blank lines are removed: the text comes from
+        between the START and END marker lines, so neither the markers nor
+        the typed command line can be part of it.
         """
-        # Regex to strip common shell prompt prefixes (e.g. "$ ", "# ", "> ")
-        prompt_prefix_re = re.compile(r"^[\$#>]\s*")
-
-        lines = raw.splitlines()
-        cleaned: list[str] = []
-        cmd_stripped = command.strip()
-        for line in lines:
-            stripped = line.strip()
-            # Strip prompt prefix for comparison purposes
-            without_prompt = prompt_prefix_re.sub("", stripped)
-            # Skip the echo commands for markers (full or partial line)
-            if without_prompt.startswith("echo '__TMUX_BRIDGE_"):
-                continue
-            # Skip the echoed command (with or without prompt prefix)
-            if without_prompt == cmd_stripped:
-                continue
-            # Skip shell prompts that echo the marker/command
-            # (e.g. "$ echo '__TMUX_BRIDGE_START_xxx__'")
-            if "__TMUX_BRIDGE_" in stripped:
-                continue
-            cleaned.append(line)
-
-        # Strip leading/trailing empty lines
-        text = "\n".join(cleaned).strip()
-        # Remove a trailing partial echo line that may remain when the
-        # end-marker string is found inside its own echo command line in
-        # the buffer (e.g. a trailing "echo '" fragment).
-        text = re.sub(r"\necho\s+['\"]?\s*$", "", text)
-        # Also remove the prompt line at the end if present
-        return text
+        return raw.strip()
+
+    def _run_tmux(self, *args: str) -> bytes:
+        """Run a tmux subcommand over the control-mode client.
+
+        Returns the raw output; raises :class:`TmuxError` if tmux reports an
+        error.
+        """
+        return self._control().command(*args)
 
     @staticmethod
-    def _run_tmux(*args: str) -> str:
-        """Run a tmux subcommand and return stdout.
+    def _run_tmux_once(*args: str) -> bytes:
+        """Run a tmux subcommand in a one-shot client and return stdout.
 
-        Raises :class:`TmuxError` on non-zero exit.
+        Used where no session is attached yet.  Raises :class:`TmuxError`
+        on non-zero exit.
         """
         cmd = ["tmux", *args]
         try:
-            result = subprocess.run(
+            # Descriptors are created non-inheritable, so there is nothing for
+            # close_fds to do except walk the whole descriptor table.
+            return subprocess.check_output(
                 cmd,
-                capture_output=True,
-                text=True,
+                stderr=subprocess.PIPE,
                 timeout=10,
+                close_fds=False,
             )
         except FileNotFoundError:
             raise TmuxError(
@@ -386,10 +796,9 @@ class TmuxController:
             raise TmuxError(
                 f"tmux command timed out: {' '.join(cmd)}"
             ) from None
-
-        if result.returncode != 0:
+        except subprocess.CalledProcessError as e:
             raise TmuxError(
-                f"tmux command failed (rc={result.returncode}): "
-                f"{' '.join(cmd)}\nstderr: {result.stderr.strip()}"
-            )
-        return result.stdout
+                f"tmux command failed (rc={e.returncode}): "
+                f"{' '.join(cmd)}\n"
+                f"stderr: {e.stderr.decode('utf-8', 'replace').strip()}"
+            ) from None